@@ -12,8 +12,10 @@ import pandas as pd
 from elementy import PeriodicTable
 
 from .alloy import Alloy
+from .batch import AlloyBatch
 from . import (
     analyse,
+    batch,
     constants,
     density,
     enthalpy,
@@ -155,6 +157,7 @@ def write_csv(
 __all__ = [
     "periodic_table",
     "Alloy",
+    "AlloyBatch",
     "Prototype",
     "prototypes",
     "linear_mixture",
@@ -174,6 +177,7 @@ __all__ = [
     "plot",
     "plots",
     "generate",
+    "batch",
     "calculate",
     "properties",
     "analyse",
@@ -0,0 +1,576 @@
+"""Module providing a matrix representation of many alloy compositions, and
+vectorised utilities acting upon them."""
+
+import copy
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+import metallurgy as mg
+
+
+class AlloyBatch:
+    """A batch of alloys, stored as a matrix of atomic fractions.
+
+    :group: alloy
+
+    Attributes
+    ----------
+
+    compositions
+        Array of shape (number of alloys, number of elements) containing the
+        fraction of each element in each alloy. Rows sum to 1.
+    elements
+        Element symbols labelling the columns of the compositions matrix.
+    structures
+        Optional list of crystal structure prototype names, one per alloy.
+    constraints
+        Optional dictionary of constraints shared by every alloy in the
+        batch, in the same form accepted by :class:`~metallurgy.alloy.Alloy`.
+    data
+        Dictionary matching names to arrays of per-alloy data.
+
+    """
+
+    def __init__(
+        self,
+        compositions: Union[np.ndarray, Sequence[Sequence[float]]],
+        elements: Sequence[str],
+        structures: Optional[Sequence[Optional[str]]] = None,
+        constraints: Optional[dict] = None,
+        data: Optional[dict] = None,
+    ):
+        self.elements = list(elements)
+        compositions = np.asarray(compositions, dtype=float)
+        if compositions.ndim == 1:
+            compositions = compositions.reshape(-1, len(self.elements))
+        if compositions.shape[1] != len(self.elements):
+            raise ValueError(
+                "Composition matrix has "
+                + str(compositions.shape[1])
+                + " columns but "
+                + str(len(self.elements))
+                + " elements were given."
+            )
+        self.compositions = compositions
+
+        if structures is not None:
+            structures = list(structures)
+            if len(structures) != len(compositions):
+                raise ValueError("Must provide one structure per alloy.")
+        self.structures = structures
+
+        self.constraints = constraints
+
+        self.data = {}
+        if data is not None:
+            for name in data:
+                self.data[name] = np.asarray(data[name])
+
+    @classmethod
+    def from_alloys(
+        cls,
+        alloys: Sequence[Union[mg.Alloy, str, dict]],
+        elements: Optional[Sequence[str]] = None,
+    ) -> "AlloyBatch":
+        """Create a batch from a list of alloys.
+
+        :group: alloy.utils
+
+        Parameters
+        ----------
+
+        alloys
+            The alloys to place in the batch.
+        elements
+            Column ordering of the composition matrix. If not set, the
+            elements are ordered by first appearance in the alloys.
+
+        """
+
+        if isinstance(alloys, AlloyBatch):
+            if elements is None:
+                return alloys
+            return alloys.with_elements(elements)
+
+        alloys = [
+            a if isinstance(a, mg.Alloy) else mg.Alloy(a) for a in alloys
+        ]
+
+        if elements is None:
+            elements = list(
+                dict.fromkeys(e for alloy in alloys for e in alloy.elements)
+            )
+        element_index = {e: i for i, e in enumerate(elements)}
+
+        compositions = np.zeros((len(alloys), len(elements)))
+        for i, alloy in enumerate(alloys):
+            for element, percentage in alloy.composition.items():
+                compositions[i, element_index[element]] = percentage
+
+        structures = None
+        if any(alloy.structure is not None for alloy in alloys):
+            structures = [
+                alloy.structure.name if alloy.structure is not None else None
+                for alloy in alloys
+            ]
+
+        constraints = None
+        if len(alloys) > 0 and alloys[0].constraints is not None:
+            constraints = raw_constraints(alloys[0].constraints)
+
+        return cls(
+            compositions,
+            elements,
+            structures=structures,
+            constraints=constraints,
+        )
+
+    def __len__(self) -> int:
+        return len(self.compositions)
+
+    def __iter__(self) -> Iterator[mg.Alloy]:
+        for i in range(len(self)):
+            yield self.alloy(i)
+
+    def __getitem__(self, index) -> Union[mg.Alloy, "AlloyBatch"]:
+        if isinstance(index, (int, np.integer)):
+            return self.alloy(index)
+
+        if isinstance(index, slice):
+            rows = np.arange(len(self))[index]
+        else:
+            rows = np.arange(len(self))[np.asarray(index)]
+
+        return AlloyBatch(
+            self.compositions[rows],
+            self.elements,
+            structures=[self.structures[i] for i in rows]
+            if self.structures is not None
+            else None,
+            constraints=self.constraints,
+            data={name: self.data[name][rows] for name in self.data},
+        )
+
+    def __repr__(self) -> str:
+        return (
+            "AlloyBatch("
+            + str(len(self))
+            + " alloys, elements="
+            + str(self.elements)
+            + ")"
+        )
+
+    @property
+    def element_index(self) -> dict:
+        """Dictionary matching element symbols to column indices.
+
+        :group: alloy.utils
+        """
+        return {e: i for i, e in enumerate(self.elements)}
+
+    @property
+    def presence(self) -> np.ndarray:
+        """Boolean matrix, True where an element is present in an alloy.
+
+        :group: alloy.utils
+        """
+        return self.compositions > 0
+
+    @property
+    def num_elements(self) -> np.ndarray:
+        """Number of elements present in each alloy.
+
+        :group: alloy.utils
+        """
+        return self.presence.sum(axis=1)
+
+    def alloy(self, index: int) -> mg.Alloy:
+        """Create an :class:`~metallurgy.alloy.Alloy` from a row of the batch.
+
+        :group: alloy.utils
+
+        Parameters
+        ----------
+
+        index
+            Row of the batch to convert.
+
+        """
+
+        row = self.compositions[index]
+        composition = {
+            self.elements[j]: float(row[j]) for j in np.flatnonzero(row > 0)
+        }
+
+        structure = None
+        if self.structures is not None:
+            structure = self.structures[index]
+
+        constraints = None
+        if self.constraints is not None:
+            constraints = copy.deepcopy(self.constraints)
+
+        return mg.Alloy(
+            composition, structure=structure, constraints=constraints
+        )
+
+    def to_alloys(self) -> List[mg.Alloy]:
+        """Convert the batch to a list of :class:`~metallurgy.alloy.Alloy`.
+
+        :group: alloy.utils
+        """
+        return [self.alloy(i) for i in range(len(self))]
+
+    def with_elements(self, elements: Sequence[str]) -> "AlloyBatch":
+        """Return a copy of the batch with columns reordered to match
+        elements. Elements not previously in the batch are given zero
+        fractions.
+
+        :group: alloy.utils
+
+        Parameters
+        ----------
+
+        elements
+            The new column ordering of the composition matrix. Must include
+            every element present in the batch.
+
+        """
+
+        elements = list(elements)
+        element_index = {e: i for i, e in enumerate(elements)}
+
+        missing = [
+            e
+            for j, e in enumerate(self.elements)
+            if e not in element_index and np.any(self.compositions[:, j] > 0)
+        ]
+        if len(missing) > 0:
+            raise ValueError(
+                "Elements present in batch missing from new columns: "
+                + str(missing)
+            )
+
+        compositions = np.zeros((len(self), len(elements)))
+        for j, element in enumerate(self.elements):
+            if element in element_index:
+                compositions[:, element_index[element]] = self.compositions[
+                    :, j
+                ]
+
+        return AlloyBatch(
+            compositions,
+            elements,
+            structures=self.structures,
+            constraints=self.constraints,
+            data=self.data,
+        )
+
+
+def raw_constraints(constraints: dict) -> dict:
+    """Strip the derived entries from a parsed set of constraints, such that
+    they may be passed again to :func:`~metallurgy.alloy.parse_constraints`.
+
+    :group: alloy.utils
+
+    Parameters
+    ----------
+
+    constraints
+        Constraints, either parsed or as originally provided.
+
+    """
+
+    constraints = copy.deepcopy(constraints)
+    for key in ["local_percentages", "digits"]:
+        if key in constraints:
+            del constraints[key]
+    return constraints
+
+
+def constraint_bounds(
+    constraints: Optional[dict], elements: Sequence[str]
+) -> dict:
+    """Convert constraints into arrays aligned with a list of elements.
+
+    :group: alloy.utils
+
+    Parameters
+    ----------
+
+    constraints
+        Constraints in the form accepted by
+        :class:`~metallurgy.alloy.Alloy`, or None.
+    elements
+        Element symbols labelling the columns of a composition matrix.
+
+    Returns
+    -------
+
+    Dictionary containing arrays of the minimum ("min"), maximum ("max") and
+    precedence ("precedence") of each element, a boolean array of allowed
+    elements ("allowed"), and the "min_elements", "max_elements" and
+    "percentage_step" constraints.
+
+    """
+
+    num_elements = len(elements)
+    bounds = {
+        "min": np.zeros(num_elements),
+        "max": np.ones(num_elements),
+        "precedence": np.zeros(num_elements),
+        "allowed": np.ones(num_elements, dtype=bool),
+        "min_elements": 1,
+        "max_elements": num_elements,
+        "percentage_step": 0.01,
+    }
+    if constraints is None:
+        return bounds
+
+    parsed = mg.alloy.parse_constraints(**raw_constraints(constraints))
+
+    percentages = parsed["percentages"]
+    allowed_elements = set(parsed["allowed_elements"]) | set(percentages)
+    for j, element in enumerate(elements):
+        bounds["allowed"][j] = element in allowed_elements
+        if element in percentages:
+            bounds["min"][j] = percentages[element]["min"]
+            bounds["max"][j] = percentages[element]["max"]
+            bounds["precedence"][j] = percentages[element]["precedence"]
+
+    bounds["min_elements"] = parsed["min_elements"]
+    bounds["max_elements"] = min(parsed["max_elements"], num_elements)
+    if parsed["percentage_step"] is not None:
+        bounds["percentage_step"] = parsed["percentage_step"]
+
+    return bounds
+
+
+def random_column(
+    mask: np.ndarray, rng: np.random.Generator
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Choose a random True column from each row of a boolean matrix.
+
+    :group: alloy.utils
+
+    Parameters
+    ----------
+
+    mask
+        Boolean matrix of columns eligible for selection.
+    rng
+        Random number generator.
+
+    Returns
+    -------
+
+    The chosen column per row, and a boolean array which is False for rows
+    with no eligible columns.
+
+    """
+
+    keys = np.where(mask, rng.random(mask.shape), -1.0)
+    return np.argmax(keys, axis=1), mask.any(axis=1)
+
+
+def project(
+    compositions: np.ndarray,
+    elements: Sequence[str],
+    constraints: Optional[dict] = None,
+    rng: Optional[Union[np.random.Generator, int]] = None,
+) -> np.ndarray:
+    """Project a composition matrix onto the region allowed by constraints.
+
+    Every row is adjusted to contain between min_elements and max_elements
+    allowed elements, including those with a minimum percentage or positive
+    precedence. Fractions are then moved to the nearest point on the simplex
+    respecting each element's minimum and maximum, with higher precedence
+    elements given larger fractions, and finally rounded to multiples of the
+    percentage step while maintaining the sum.
+
+    :group: alloy.utils
+
+    Parameters
+    ----------
+
+    compositions
+        Matrix of element fractions, one row per alloy.
+    elements
+        Element symbols labelling the columns of compositions.
+    constraints
+        Constraints in the form accepted by
+        :class:`~metallurgy.alloy.Alloy`. If None, rows are only normalised.
+    rng
+        Random number generator, or seed, used when elements must be added to
+        satisfy min_elements.
+
+    """
+
+    rng = np.random.default_rng(rng)
+    compositions = np.clip(np.array(compositions, dtype=float), 0, None)
+
+    if constraints is None:
+        return normalise(compositions)
+
+    bounds = constraint_bounds(constraints, elements)
+    step = bounds["percentage_step"]
+    required = bounds["allowed"] & (
+        (bounds["min"] > 0) | (bounds["precedence"] > 0)
+    )
+    rows = np.arange(len(compositions))
+
+    present = (compositions > 0) & bounds["allowed"]
+    present |= required
+
+    counts = present.sum(axis=1)
+    excess = counts > bounds["max_elements"]
+    if np.any(excess):
+        priority = np.where(required, np.inf, compositions)
+        priority = np.where(present, priority, -np.inf)
+        order = np.argsort(-priority, axis=1)
+        rank = np.empty_like(order)
+        rank[rows[:, None], order] = np.arange(len(elements))
+        present[excess] &= rank[excess] < bounds["max_elements"]
+
+    deficit = np.maximum(bounds["min_elements"] - present.sum(axis=1), 0)
+    for _ in range(int(deficit.max(initial=0))):
+        needs_element = deficit > 0
+        column, valid = random_column(~present & bounds["allowed"], rng)
+        needs_element &= valid
+        present[rows[needs_element], column[needs_element]] = True
+        deficit -= needs_element
+
+    lower = np.where(present, np.maximum(bounds["min"], step), 0)
+    upper = np.where(present, np.maximum(bounds["max"], lower), 0)
+    compositions = np.where(present, np.maximum(compositions, step), 0)
+
+    if np.any(bounds["precedence"] > 0):
+        compositions = order_by_precedence(
+            compositions, present, bounds["precedence"]
+        )
+
+    compositions = project_to_box_simplex(compositions, lower, upper)
+
+    return round_to_step(compositions, lower, upper, step)
+
+
+def normalise(compositions: np.ndarray) -> np.ndarray:
+    """Scale each row of a composition matrix to sum to 1.
+
+    :group: alloy.utils
+
+    Parameters
+    ----------
+
+    compositions
+        Matrix of element fractions, one row per alloy.
+
+    """
+
+    totals = compositions.sum(axis=1, keepdims=True)
+    totals[totals == 0] = 1
+    return compositions / totals
+
+
+def order_by_precedence(
+    compositions: np.ndarray, present: np.ndarray, precedence: np.ndarray
+) -> np.ndarray:
+    """Permute the fractions in each row such that elements with higher
+    precedence hold larger fractions. Elements of equal precedence keep their
+    relative ordering.
+
+    :group: alloy.utils
+    """
+
+    rows = np.arange(len(compositions))[:, None]
+
+    # Precedence is the primary sort key and the current fraction (<= 1) the
+    # secondary key.
+    keys = np.where(present, precedence * 2 + compositions, -np.inf)
+    columns = np.argsort(-keys, axis=1)
+    values = -np.sort(-np.where(present, compositions, -np.inf), axis=1)
+
+    ordered = np.zeros_like(compositions)
+    ordered[rows, columns] = values
+    return np.where(present, ordered, 0)
+
+
+def project_to_box_simplex(
+    compositions: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    iterations: int = 60,
+) -> np.ndarray:
+    """Euclidean projection of each row onto the simplex intersected with
+    per-element bounds, found by bisection on the shared shift of the row.
+    Rows for which the bounds are infeasible are only normalised.
+
+    :group: alloy.utils
+    """
+
+    lower = np.broadcast_to(lower, compositions.shape)
+    upper = np.broadcast_to(upper, compositions.shape)
+
+    low = (lower - compositions).min(axis=1)
+    high = (upper - compositions).max(axis=1)
+    for _ in range(iterations):
+        shift = (low + high) / 2
+        total = np.clip(compositions + shift[:, None], lower, upper).sum(
+            axis=1
+        )
+        too_large = total > 1
+        high = np.where(too_large, shift, high)
+        low = np.where(too_large, low, shift)
+
+    projected = np.clip(compositions + high[:, None], lower, upper)
+
+    feasible = (lower.sum(axis=1) <= 1) & (upper.sum(axis=1) >= 1)
+    return np.where(feasible[:, None], projected, normalise(compositions))
+
+
+def round_to_step(
+    compositions: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    step: float,
+) -> np.ndarray:
+    """Round fractions to multiples of step while maintaining the sum of each
+    row, distributing the remainder to the fractions with the largest
+    rounding error which remain within their bounds.
+
+    :group: alloy.utils
+    """
+
+    total = int(round(1 / step))
+    rows = np.arange(len(compositions))
+
+    units = compositions / step
+    lower_units = np.ceil(np.broadcast_to(lower, units.shape) / step - 1e-9)
+    upper_units = np.floor(np.broadcast_to(upper, units.shape) / step + 1e-9)
+    upper_units = np.maximum(upper_units, lower_units)
+
+    rounded = np.clip(np.floor(units + 1e-9), lower_units, upper_units)
+    remainder = units - rounded
+    deficit = total - rounded.sum(axis=1)
+
+    for _ in range(int(np.abs(deficit).max(initial=0))):
+        increase = deficit > 0
+        candidates = np.where(rounded < upper_units, remainder, -np.inf)
+        column = np.argmax(candidates, axis=1)
+        increase &= np.isfinite(candidates[rows, column])
+        rounded[rows[increase], column[increase]] += 1
+        remainder[rows[increase], column[increase]] -= 1
+        deficit -= increase
+
+        decrease = deficit < 0
+        candidates = np.where(
+            (rounded > lower_units) & (rounded > 0), remainder, np.inf
+        )
+        column = np.argmin(candidates, axis=1)
+        decrease &= np.isfinite(candidates[rows, column])
+        rounded[rows[decrease], column[decrease]] -= 1
+        remainder[rows[decrease], column[decrease]] += 1
+        deficit += decrease
+
+    return np.round(rounded * step, 10)
@@ -1,13 +1,22 @@
+import copy
 import re
+import warnings
 from numbers import Number
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 
 import elementy
 import numpy as np
 
 import metallurgy as mg
 
-from .prototypes import get_random_prototype
+from .batch import (
+    AlloyBatch,
+    constraint_bounds,
+    project,
+    random_column,
+    raw_constraints,
+)
+from .prototypes import get_random_prototype, prototypes
 
 
 def random_alloy(
@@ -31,6 +40,16 @@ def random_alloy(
 
     """
 
+    if constrain_alloy and not structure:
+        return constrained_random_alloys(
+            1,
+            min_elements,
+            max_elements,
+            percentage_constraints,
+            percentage_step,
+            allowed_elements,
+        )[0]
+
     if allowed_elements is None:
         allowed_elements = [e for e in elementy.PeriodicTable().elements]
     if percentage_step is None:
@@ -152,6 +171,16 @@ def random_alloys(
 
     """
 
+    if constrain_alloys and not structures:
+        return constrained_random_alloys(
+            num_alloys,
+            min_elements,
+            max_elements,
+            percentage_constraints,
+            percentage_step,
+            allowed_elements,
+        ).to_alloys()
+
     return [
         random_alloy(
             min_elements,
@@ -166,6 +195,616 @@ def random_alloys(
     ]
 
 
+def constrained_random_alloys(
+    num_alloys: int,
+    min_elements: int = 1,
+    max_elements: int = 10,
+    percentage_constraints: Optional[Union[dict, list]] = None,
+    percentage_step: Optional[float] = None,
+    allowed_elements: Optional[list] = None,
+    rng: Optional[Union[np.random.Generator, int]] = None,
+) -> AlloyBatch:
+    """Generate random alloys drawn directly from the compositions allowed by
+    a set of constraints, without needing
+    :func:`~metallurgy.alloy.Alloy.rescale` to repair them.
+
+    The constraints are interpreted by
+    :func:`~metallurgy.alloy.parse_constraints`, including the "*" wildcard.
+    Each alloy contains between min_elements and max_elements elements,
+    chosen from the allowed elements and always including elements with a
+    minimum percentage or positive precedence. Percentages are multiples of
+    percentage_step, within each element's minimum and maximum, and ordered
+    by precedence.
+
+    :group: alloy.generate
+
+    Parameters
+    ----------
+
+    num_alloys
+        Number of alloys to generate.
+    min_elements
+        Minimum number of elements in each alloy.
+    max_elements
+        Maximum number of elements in each alloy.
+    percentage_constraints
+        Dictionary of minimum, maximum, and precedence constraints per
+        element.
+    percentage_step
+        Increment between percentages.
+    allowed_elements
+        Elements which may be included in the alloys. Defaults to the whole
+        periodic table.
+    rng
+        Random number generator, or seed.
+
+    """
+
+    rng = np.random.default_rng(rng)
+
+    if allowed_elements is None:
+        allowed_elements = list(mg.periodic_table.elements.keys())
+    if percentage_step is None:
+        percentage_step = 0.01
+    if percentage_constraints is None:
+        percentage_constraints = {}
+    elif isinstance(percentage_constraints, list):
+        percentage_constraints = {e: {} for e in percentage_constraints}
+
+    elements = list(
+        dict.fromkeys(
+            list(allowed_elements)
+            + [e for e in percentage_constraints if e != "*"]
+        )
+    )
+    constraints = raw_constraints(
+        mg.alloy.parse_constraints(
+            min_elements=min_elements,
+            max_elements=max_elements,
+            percentages=percentage_constraints,
+            allowed_elements=list(allowed_elements),
+            percentage_step=percentage_step,
+        )
+    )
+    bounds = constraint_bounds(constraints, elements)
+
+    total = int(round(1 / percentage_step))
+    lower = np.maximum(np.ceil(bounds["min"] * total - 1e-9), 1)
+    upper = np.floor(bounds["max"] * total + 1e-9)
+    precedence = bounds["precedence"]
+    required = bounds["allowed"] & ((bounds["min"] > 0) | (precedence > 0))
+
+    compositions = np.zeros((0, len(elements)))
+    for _ in range(100):
+        num_remaining = num_alloys - len(compositions)
+        if num_remaining <= 0:
+            break
+
+        columns, active = select_elements(
+            rng.random((num_remaining, len(elements))),
+            rng.random(num_remaining),
+            required,
+            bounds["allowed"],
+            bounds["min_elements"],
+            bounds["max_elements"],
+        )
+
+        # Fill entries in descending order of precedence, randomly ordering
+        # entries of equal precedence
+        keys = np.where(
+            active,
+            precedence[columns] * 2 + rng.random(columns.shape),
+            -np.inf,
+        )
+        order = np.argsort(-keys, axis=1)
+        columns = np.take_along_axis(columns, order, axis=1)
+        active = np.take_along_axis(active, order, axis=1)
+
+        units, feasible = fill_simplex(
+            rng.random(columns.shape),
+            np.where(active, lower[columns], 0),
+            np.where(active, upper[columns], 0),
+            total,
+            precedence=np.where(active, precedence[columns], -np.inf),
+        )
+
+        new_compositions = np.zeros((num_remaining, len(elements)))
+        np.put_along_axis(new_compositions, columns, units / total, axis=1)
+        compositions = np.concatenate(
+            [compositions, new_compositions[feasible]]
+        )
+
+    if len(compositions) < num_alloys:
+        raise ValueError(
+            "Could not generate alloys satisfying constraints: "
+            + str(percentage_constraints)
+        )
+
+    return AlloyBatch(
+        np.round(compositions[:num_alloys], 10),
+        elements,
+        constraints=constraints,
+    )
+
+
+def quasirandom_alloys(
+    num_alloys: int,
+    elements: Union[list, str],
+    method: str = "sobol",
+    min_elements: Optional[int] = None,
+    max_elements: Optional[int] = None,
+    percentage_constraints: Optional[dict] = None,
+    percentage_step: float = 0.01,
+    rng: Optional[Union[np.random.Generator, int]] = None,
+) -> AlloyBatch:
+    """Generate alloys covering a composition-space evenly, using
+    low-discrepancy points mapped onto the composition simplex.
+
+    Each point chooses a number of elements between min_elements and
+    max_elements, chooses which elements of the pool are present (always
+    including those with a minimum percentage), and maps its remaining
+    coordinates onto the simplex bounded by each element's minimum and
+    maximum percentage with :func:`~metallurgy.generate.fill_simplex`.
+    Points for which the chosen elements cannot satisfy the constraints are
+    skipped in favour of later points of the sequence.
+
+    :group: alloy.generate
+
+    Parameters
+    ----------
+
+    num_alloys
+        Number of alloys to generate.
+    elements
+        Pool of elements from which alloys are composed.
+    method
+        Either "sobol", "halton" (both requiring scipy), or "lhs" for latin
+        hypercube sampling.
+    min_elements
+        Minimum number of elements in each alloy, defaults to the size of the
+        pool.
+    max_elements
+        Maximum number of elements in each alloy, defaults to the size of the
+        pool.
+    percentage_constraints
+        Dictionary of minimum and maximum percentages per element, as used by
+        :func:`~metallurgy.generate.random_alloy`.
+    percentage_step
+        Increment between percentages.
+    rng
+        Random number generator, or seed, used to scramble the sequence.
+
+    """
+
+    rng = np.random.default_rng(rng)
+
+    if isinstance(elements, str):
+        elements = re.findall("[A-Z][^A-Z]*", elements)
+    pool = list(elements)
+
+    if percentage_constraints is None:
+        percentage_constraints = {}
+    elif isinstance(percentage_constraints, list):
+        percentage_constraints = {e: {} for e in percentage_constraints}
+    elements = list(
+        dict.fromkeys(pool + [e for e in percentage_constraints if e != "*"])
+    )
+
+    if max_elements is None:
+        max_elements = len(elements)
+    if min_elements is None:
+        min_elements = max_elements
+    max_elements = min(max_elements, len(elements))
+    min_elements = min(min_elements, max_elements)
+
+    constraints = {
+        "percentages": copy.deepcopy(percentage_constraints),
+        "min_elements": min_elements,
+        "max_elements": max_elements,
+        "percentage_step": percentage_step,
+        "allowed_elements": pool[:],
+    }
+    bounds = constraint_bounds(constraints, elements)
+
+    total = int(round(1 / percentage_step))
+    lower = np.maximum(np.ceil(bounds["min"] * total - 1e-9), 1)
+    upper = np.floor(bounds["max"] * total + 1e-9)
+    required = bounds["min"] > 0
+
+    choose_elements = min_elements < len(elements)
+    dimensions = max_elements
+    if choose_elements:
+        dimensions += len(elements) + 1
+
+    compositions = np.zeros((0, len(elements)))
+    while len(compositions) < num_alloys:
+        points = quasirandom_points(
+            max(num_alloys - len(compositions), 2), dimensions, method, rng
+        )
+
+        if choose_elements:
+            columns, active = select_elements(
+                points[:, : len(elements)],
+                points[:, len(elements)],
+                required,
+                bounds["allowed"],
+                min_elements,
+                max_elements,
+            )
+            points = points[:, len(elements) + 1 :]
+        else:
+            columns = np.tile(np.arange(len(elements)), (len(points), 1))
+            active = np.ones(columns.shape, dtype=bool)
+
+        units, feasible = fill_simplex(
+            points,
+            np.where(active, lower[columns], 0),
+            np.where(active, upper[columns], 0),
+            total,
+        )
+
+        new_compositions = np.zeros((len(points), len(elements)))
+        np.put_along_axis(new_compositions, columns, units / total, axis=1)
+        compositions = np.concatenate(
+            [compositions, new_compositions[feasible]]
+        )
+
+    return AlloyBatch(
+        np.round(compositions[:num_alloys], 10),
+        elements,
+        constraints=constraints,
+    )
+
+
+def quasirandom_points(
+    num_points: int,
+    dimensions: int,
+    method: str = "sobol",
+    rng: Optional[Union[np.random.Generator, int]] = None,
+) -> np.ndarray:
+    """Generate points in the unit hypercube with low discrepancy.
+
+    :group: alloy.generate
+
+    Parameters
+    ----------
+
+    num_points
+        Number of points to generate.
+    dimensions
+        Dimension of the hypercube.
+    method
+        Either "sobol", "halton" (both requiring scipy), or "lhs" for latin
+        hypercube sampling.
+    rng
+        Random number generator, or seed, used to scramble the points.
+
+    """
+
+    rng = np.random.default_rng(rng)
+    dimensions = max(dimensions, 1)
+
+    if method == "lhs":
+        strata = np.argsort(rng.random((dimensions, num_points)), axis=1).T
+        return (strata + rng.random((num_points, dimensions))) / num_points
+
+    elif method in ["sobol", "halton"]:
+        from scipy.stats import qmc
+
+        if method == "sobol":
+            sampler = qmc.Sobol(dimensions, scramble=True, seed=rng)
+        else:
+            sampler = qmc.Halton(dimensions, scramble=True, seed=rng)
+
+        with warnings.catch_warnings():
+            # Sobol sequences warn when the number of points is not a power
+            # of two, which does not matter here.
+            warnings.simplefilter("ignore", UserWarning)
+            return sampler.random(num_points)
+
+    raise ValueError("Unknown quasi-random sampling method: " + str(method))
+
+
+def select_elements(
+    keys: np.ndarray,
+    counts: np.ndarray,
+    required: np.ndarray,
+    allowed: np.ndarray,
+    min_elements: int,
+    max_elements: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Choose the elements present in each alloy from uniform random numbers.
+
+    :group: alloy.generate
+
+    Parameters
+    ----------
+
+    keys
+        Array of shape (number of alloys, number of elements), the elements
+        with the smallest keys are chosen.
+    counts
+        Uniform random numbers determining the number of elements chosen.
+    required
+        Boolean array of elements which must always be chosen.
+    allowed
+        Boolean array of elements which may be chosen.
+    min_elements
+        Minimum number of elements chosen.
+    max_elements
+        Maximum number of elements chosen.
+
+    Returns
+    -------
+
+    Array of shape (number of alloys, max_elements) containing the indices of
+    the chosen elements, and a boolean array of the same shape which is False
+    for padding entries.
+
+    """
+
+    min_elements = max(min_elements, int(np.count_nonzero(required)), 1)
+    max_elements = min(max_elements, int(np.count_nonzero(allowed | required)))
+    min_elements = min(min_elements, max_elements)
+
+    num_chosen = min_elements + np.floor(
+        counts * (max_elements - min_elements + 1)
+    ).astype(int)
+    num_chosen = np.minimum(num_chosen, max_elements)
+
+    keys = np.where(required, -1.0, np.where(allowed, keys, 2.0))
+    columns = np.argsort(keys, axis=1)[:, :max_elements]
+    active = np.arange(max_elements) < num_chosen[:, None]
+
+    return columns, active
+
+
+def fill_simplex(
+    uniforms: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    total: int,
+    precedence: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Map uniform random numbers onto integer compositions summing to total,
+    with each entry between its lower and upper bound.
+
+    Entries are filled in order, each drawn from the marginal distribution
+    of a uniform point on the simplex truncated to the range that leaves the
+    remaining entries satisfiable. Without bounds this is the inverse of the
+    stick-breaking construction of the uniform distribution on the simplex,
+    so evenly spread inputs give evenly spread compositions.
+
+    :group: alloy.generate
+
+    Parameters
+    ----------
+
+    uniforms
+        Array of uniform random numbers, with at least as many columns as
+        lower.
+    lower
+        Integer lower bound of each entry. Entries with an upper bound of zero
+        are absent.
+    upper
+        Integer upper bound of each entry.
+    total
+        The sum of each composition, the number of percentage steps in 1.
+    precedence
+        Optional precedence of each entry, which must be in descending order
+        along each row. No entry may exceed an entry of higher precedence.
+
+    Returns
+    -------
+
+    The integer compositions, and a boolean array which is False for rows
+    whose bounds cannot be satisfied.
+
+    """
+
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    num_rows, num_entries = lower.shape
+    units = np.zeros(lower.shape)
+
+    if precedence is None:
+        precedence = np.zeros(lower.shape)
+    precedence = np.where(upper > 0, precedence, -np.inf)
+
+    lower_after = np.cumsum(lower[:, ::-1], axis=1)[:, ::-1] - lower
+    active_after = np.cumsum((upper > 0)[:, ::-1], axis=1)[:, ::-1] - (
+        upper > 0
+    )
+
+    feasible = (lower.sum(axis=1) <= total) & (upper.sum(axis=1) >= total)
+
+    # The largest value each entry may take given the entries of higher
+    # precedence sampled so far
+    caps = upper.copy()
+
+    remaining = np.full(num_rows, float(total))
+    for j in range(num_entries):
+        later = np.arange(num_entries) > j
+        inferior = later & (precedence < precedence[:, j : j + 1])
+
+        # Entries of lower precedence must fit beneath this entry
+        low = np.maximum(
+            lower[:, j],
+            np.where(inferior, lower, 0).max(axis=1, initial=0),
+        )
+        high = np.minimum(caps[:, j], remaining - lower_after[:, j])
+
+        # Largest total the later entries could reach if this entry took
+        # each candidate value, finding the smallest candidate which still
+        # allows the remaining percentage to be used up
+        limits = later_entry_limits(caps, precedence, j)
+        fixed_capacity = np.where(later & ~inferior, limits, 0).sum(axis=1)
+
+        def reachable(value):
+            return (
+                value
+                + fixed_capacity
+                + np.where(
+                    inferior, np.minimum(limits, value[:, None]), 0
+                ).sum(axis=1)
+                >= remaining
+            )
+
+        search_low = low - 1
+        search_high = np.where(reachable(low), low, np.maximum(high, low))
+        while np.any(search_high - search_low > 1):
+            searching = search_high - search_low > 1
+            middle = np.floor((search_low + search_high) / 2)
+            middle_reachable = reachable(middle)
+            search_high = np.where(
+                searching & middle_reachable, middle, search_high
+            )
+            search_low = np.where(
+                searching & ~middle_reachable, middle, search_low
+            )
+        low = search_high
+
+        feasible &= low <= high
+        high = np.maximum(high, low)
+
+        units[:, j] = sample_truncated_stick(
+            uniforms[:, j], low, high, remaining, active_after[:, j]
+        )
+        remaining -= units[:, j]
+
+        caps = np.where(inferior, np.minimum(caps, units[:, j : j + 1]), caps)
+
+    feasible &= remaining == 0
+
+    return units, feasible
+
+
+def later_entry_limits(
+    caps: np.ndarray, precedence: np.ndarray, position: int
+) -> np.ndarray:
+    """Largest value each entry after position may take, accounting for
+    the entries of higher precedence between them and position.
+
+    :group: alloy.generate
+    """
+
+    limits = caps.copy()
+    num_entries = caps.shape[1]
+
+    running_min = np.full(len(caps), np.inf)
+    group_min = np.full(len(caps), np.inf)
+    for k in range(position + 1, num_entries):
+        new_group = precedence[:, k] < precedence[:, k - 1]
+        new_group |= k == position + 1
+        running_min = np.where(
+            new_group & (k > position + 1),
+            np.minimum(running_min, group_min),
+            running_min,
+        )
+        group_min = np.where(new_group, np.inf, group_min)
+
+        limits[:, k] = np.minimum(caps[:, k], running_min)
+        group_min = np.minimum(group_min, limits[:, k])
+
+    return limits
+
+
+def sample_truncated_stick(
+    uniforms: np.ndarray,
+    low: np.ndarray,
+    high: np.ndarray,
+    remaining: np.ndarray,
+    num_after: np.ndarray,
+) -> np.ndarray:
+    """Map uniform random numbers to integer pieces of a remaining stick,
+    following the Beta(1, num_after) distribution of the first piece of a
+    uniformly broken stick, truncated to between low and high.
+
+    :group: alloy.generate
+    """
+
+    safe_remaining = np.where(remaining > 0, remaining, 1)
+    safe_num_after = np.maximum(num_after, 1)
+
+    def cdf(x):
+        fraction = np.clip(x / safe_remaining, 0, 1)
+        return 1 - (1 - fraction) ** safe_num_after
+
+    u = cdf(low) + uniforms * (cdf(high) - cdf(low))
+    fraction = 1 - (1 - u) ** (1 / safe_num_after)
+    values = np.clip(np.round(fraction * safe_remaining), low, high)
+
+    return np.where(num_after > 0, values, np.clip(remaining, low, high))
+
+
+def merge_constraints(alloys: List[mg.Alloy]) -> Optional[dict]:
+    """Combine the constraints of several alloys into the loosest set of
+    constraints satisfied by each of them.
+
+    :group: alloy.generate
+
+    Parameters
+    ----------
+
+    alloys
+        The alloys whose constraints are merged.
+
+    """
+
+    constraints = None
+    for alloy in alloys:
+        if alloy.constraints is None:
+            continue
+
+        if constraints is None:
+            constraints = {
+                "percentages": {},
+                "min_elements": 1,
+                "max_elements": 1,
+                "percentage_step": 0.01,
+            }
+
+        if "min_elements" in alloy.constraints:
+            constraints["min_elements"] = max(
+                constraints["min_elements"],
+                alloy.constraints["min_elements"],
+            )
+        if "max_elements" in alloy.constraints:
+            constraints["max_elements"] = max(
+                constraints["max_elements"],
+                alloy.constraints["max_elements"],
+            )
+        if "percentage_step" in alloy.constraints:
+            constraints["percentage_step"] = min(
+                constraints["percentage_step"],
+                alloy.constraints["percentage_step"],
+            )
+
+        if "percentages" not in alloy.constraints:
+            continue
+
+        for element in alloy.constraints["percentages"]:
+            element_constraints = alloy.constraints["percentages"][element]
+            if element not in constraints["percentages"]:
+                constraints["percentages"][element] = {}
+            merged = constraints["percentages"][element]
+
+            for key, combine in [
+                ("min", min),
+                ("max", max),
+                ("precedence", max),
+            ]:
+                if key in element_constraints:
+                    if key not in merged:
+                        merged[key] = element_constraints[key]
+                    else:
+                        merged[key] = combine(
+                            merged[key], element_constraints[key]
+                        )
+
+    return constraints
+
+
 def mixture(alloys: List[mg.Alloy], weights: Optional[list] = None):
     """Mix some alloys.
 
@@ -181,9 +820,7 @@ def mixture(alloys: List[mg.Alloy], weights: Optional[list] = None):
 
     """
 
-    for i in range(len(alloys)):
-        if not isinstance(alloys[i], mg.Alloy):
-            alloys[i] = mg.Alloy(alloys[i])
+    alloys = [a if isinstance(a, mg.Alloy) else mg.Alloy(a) for a in alloys]
 
     if len(alloys) == 1:
         return alloys[0]
@@ -196,92 +833,7 @@ def mixture(alloys: List[mg.Alloy], weights: Optional[list] = None):
                 shared_composition_space.append(element)
         structures.append(alloy.structure)
 
-    constraints = None
-    for alloy in alloys:
-        if alloy.constraints is not None:
-            if constraints is None:
-                constraints = {
-                    "percentages": {},
-                    "min_elements": 1,
-                    "max_elements": 1,
-                    "percentage_step": 0.01,
-                }
-
-            if "min_elements" in alloy.constraints:
-                constraints["min_elements"] = max(
-                    constraints["min_elements"],
-                    alloy.constraints["min_elements"],
-                )
-            if "max_elements" in alloy.constraints:
-                constraints["max_elements"] = max(
-                    constraints["max_elements"],
-                    alloy.constraints["max_elements"],
-                )
-            if "percentage_step" in alloy.constraints:
-                constraints["percentage_step"] = min(
-                    constraints["percentage_step"],
-                    alloy.constraints["percentage_step"],
-                )
-
-            if "percentages" in alloy.constraints:
-                for element in alloy.constraints["percentages"]:
-                    if element not in constraints:
-                        constraints["percentages"][element] = {}
-
-                    if "min" in alloy.constraints["percentages"][element]:
-                        if "min" not in constraints["percentages"][element]:
-                            constraints["percentages"][element][
-                                "min"
-                            ] = alloy.constraints["percentages"][element][
-                                "min"
-                            ]
-                        else:
-                            constraints["percentages"][element]["min"] = min(
-                                constraints["percentages"][element]["min"],
-                                alloy.constraints["percentages"][element][
-                                    "min"
-                                ],
-                            )
-
-                    if "max" in alloy.constraints["percentages"][element]:
-                        if "max" not in constraints["percentages"][element]:
-                            constraints["percentages"][element][
-                                "max"
-                            ] = alloy.constraints["percentages"][element][
-                                "max"
-                            ]
-                        else:
-                            constraints["percentages"][element]["max"] = max(
-                                constraints["percentages"][element]["max"],
-                                alloy.constraints["percentages"][element][
-                                    "max"
-                                ],
-                            )
-
-                    if (
-                        "precedence"
-                        in alloy.constraints["percentages"][element]
-                    ):
-                        if (
-                            "precedence"
-                            not in constraints["percentages"][element]
-                        ):
-                            constraints["percentages"][element][
-                                "precedence"
-                            ] = alloy.constraints["percentages"][element][
-                                "precedence"
-                            ]
-                        else:
-                            constraints["percentages"][element][
-                                "precedence"
-                            ] = max(
-                                constraints["percentages"][element][
-                                    "precedence"
-                                ],
-                                alloy.constraints["percentages"][element][
-                                    "precedence"
-                                ],
-                            )
+    constraints = merge_constraints(alloys)
 
     if weights is None:
         weights = [1.0 / len(alloys)] * len(alloys)
@@ -305,6 +857,133 @@ def mixture(alloys: List[mg.Alloy], weights: Optional[list] = None):
     )
 
 
+def mixtures(
+    alloys: Union[AlloyBatch, List[Union[mg.Alloy, str, dict]]],
+    weights: Union[np.ndarray, List[List[float]]],
+    rng: Optional[Union[np.random.Generator, int]] = None,
+) -> AlloyBatch:
+    """Mix a set of parent alloys with many different weightings at once.
+
+    The mixed compositions are computed as a single product of the weights
+    matrix with the parents' composition matrix. The parents' constraints
+    are merged once, as in :func:`~metallurgy.generate.mixture`, and the
+    mixtures projected onto them.
+
+    :group: alloy.generate
+
+    Parameters
+    ----------
+
+    alloys
+        The K parent alloys to be mixed.
+    weights
+        Array of shape (W, K), each row being one weighting of the parents.
+        Rows are normalised to sum to 1.
+    rng
+        Random number generator, or seed, used when projecting onto
+        constraints.
+
+    """
+
+    if isinstance(alloys, AlloyBatch):
+        parents = alloys
+        constraints = parents.constraints
+    else:
+        alloys = [
+            a if isinstance(a, mg.Alloy) else mg.Alloy(a) for a in alloys
+        ]
+        parents = AlloyBatch.from_alloys(alloys)
+        constraints = merge_constraints(alloys)
+
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    if weights.shape[1] != len(parents):
+        raise ValueError("Must provide one weight per parent alloy.")
+
+    compositions = project(
+        weights @ parents.compositions, parents.elements, constraints, rng
+    )
+
+    structures = None
+    if parents.structures is not None:
+        structures = [
+            parents.structures[i] for i in np.argmin(weights, axis=1)
+        ]
+
+    return AlloyBatch(
+        compositions,
+        parents.elements,
+        structures=structures,
+        constraints=constraints,
+    )
+
+
+def pairwise_mixtures(
+    alloys_a: Union[AlloyBatch, List[Union[mg.Alloy, str, dict]]],
+    alloys_b: Union[AlloyBatch, List[Union[mg.Alloy, str, dict]]],
+    weights: Union[float, np.ndarray, List[float]] = 0.5,
+    rng: Optional[Union[np.random.Generator, int]] = None,
+) -> AlloyBatch:
+    """Mix two populations of alloys row by row, as used for crossover in
+    evolutionary searches.
+
+    :group: alloy.generate
+
+    Parameters
+    ----------
+
+    alloys_a
+        The first parent of each mixture.
+    alloys_b
+        The second parent of each mixture.
+    weights
+        The weight of the first parent in each mixture, either one value for
+        all mixtures or one per mixture.
+    rng
+        Random number generator, or seed, used when projecting onto
+        constraints.
+
+    """
+
+    batch_a = AlloyBatch.from_alloys(alloys_a)
+    batch_b = AlloyBatch.from_alloys(alloys_b)
+    if len(batch_a) != len(batch_b):
+        raise ValueError("Populations to be mixed must be the same size.")
+
+    elements = list(dict.fromkeys(batch_a.elements + batch_b.elements))
+    batch_a = batch_a.with_elements(elements)
+    batch_b = batch_b.with_elements(elements)
+
+    constraints = batch_a.constraints
+    if constraints is None:
+        constraints = batch_b.constraints
+
+    weights = np.broadcast_to(
+        np.asarray(weights, dtype=float), (len(batch_a),)
+    )[:, None]
+    compositions = project(
+        weights * batch_a.compositions + (1 - weights) * batch_b.compositions,
+        elements,
+        constraints,
+        rng,
+    )
+
+    structures = None
+    if batch_a.structures is not None or batch_b.structures is not None:
+        structures_a = batch_a.structures or [None] * len(batch_a)
+        structures_b = batch_b.structures or [None] * len(batch_b)
+        structures = [
+            a if w <= 0.5 else b
+            for a, b, w in zip(structures_a, structures_b, weights[:, 0])
+        ]
+
+    return AlloyBatch(
+        compositions,
+        elements,
+        structures=structures,
+        constraints=constraints,
+    )
+
+
 def system(
     elements: Union[list, str],
     step: Number = 1,
@@ -552,7 +1231,7 @@ def quaternary(
 
 def perturb(alloy, size=0.05):
     if isinstance(alloy, list):
-        return [perturb(a) for a in alloy]
+        return [perturb(a, size) for a in alloy]
 
     composition = dict(alloy.composition)
     structure = alloy.structure
@@ -628,3 +1307,143 @@ def perturb(alloy, size=0.05):
         composition, constraints=constraints, structure=structure
     )
     return new_alloy
+
+
+def perturb_batch(
+    population: Union[AlloyBatch, List[Union[mg.Alloy, str, dict]]],
+    size: float = 0.05,
+    rng: Optional[Union[np.random.Generator, int]] = None,
+    elements: Optional[List[str]] = None,
+    constraints: Optional[dict] = None,
+    swap_probability: float = 0.9,
+    insert_probability: float = 0.9,
+    delete_probability: float = 0.9,
+    structure_probability: float = 0.9,
+) -> AlloyBatch:
+    """Perturb every alloy in a population at once, applying the same kinds
+    of change as :func:`~metallurgy.generate.perturb` to the composition
+    matrix of the population using masks.
+
+    Each alloy has its percentages jittered by up to size, then may have an
+    element swapped for an absent element, an absent element inserted, and a
+    present element deleted, each with the given probability. The results
+    are projected back onto the constraints of the population with
+    :func:`~metallurgy.batch.project`.
+
+    :group: alloy.generate
+
+    Parameters
+    ----------
+
+    population
+        The alloys to be perturbed.
+    size
+        The maximum change to any percentage by jittering, and the maximum
+        percentage of inserted elements.
+    rng
+        Random number generator, or seed.
+    elements
+        Pool of elements which may be swapped or inserted. Defaults to the
+        elements of the population, extended by the allowed elements of the
+        constraints if set.
+    constraints
+        Constraints to project the perturbed alloys onto. Defaults to the
+        constraints of the population.
+    swap_probability
+        Probability of each alloy having an element swapped.
+    insert_probability
+        Probability of each alloy having an element inserted.
+    delete_probability
+        Probability of each alloy having an element deleted.
+    structure_probability
+        Probability of each alloy with a structure having it replaced by a
+        random prototype.
+
+    """
+
+    rng = np.random.default_rng(rng)
+
+    if not isinstance(population, AlloyBatch):
+        population = AlloyBatch.from_alloys(population)
+    if constraints is None:
+        constraints = population.constraints
+
+    if elements is None:
+        elements = list(population.elements)
+        if constraints is not None and "allowed_elements" in constraints:
+            elements += constraints["allowed_elements"]
+    elements = list(dict.fromkeys(list(population.elements) + elements))
+    population = population.with_elements(elements)
+
+    compositions = population.compositions.copy()
+    num_alloys = len(compositions)
+    rows = np.arange(num_alloys)
+
+    protected = np.zeros(len(elements), dtype=bool)
+    if constraints is not None and "percentages" in constraints:
+        for j, element in enumerate(elements):
+            if element in constraints["percentages"]:
+                element_constraints = constraints["percentages"][element]
+                protected[j] = (
+                    element_constraints.get("precedence", 0) or 0
+                ) > 0 or (element_constraints.get("min", 0) or 0) > 0
+
+    # Jitter the percentages of present elements, removing any which fall
+    # below the minimum threshold of Alloy.Composition
+    present = compositions > 0
+    compositions += np.where(
+        present, rng.uniform(-size, size, compositions.shape), 0
+    )
+    compositions = np.clip(compositions, 0, None)
+    vanished = present & (compositions < 0.0001) & ~protected
+    vanished &= (present.sum(axis=1) > 1)[:, None]
+    compositions[vanished] = 0
+    emptied = compositions.sum(axis=1) == 0
+    compositions[emptied] = population.compositions[emptied]
+
+    # Swap a present element for an absent one
+    present = compositions > 0
+    swapping = rng.random(num_alloys) < swap_probability
+    old_column, has_present = random_column(present, rng)
+    new_column, has_absent = random_column(~present, rng)
+    swapping &= has_present & has_absent
+    compositions[rows[swapping], new_column[swapping]] = compositions[
+        rows[swapping], old_column[swapping]
+    ]
+    compositions[rows[swapping], old_column[swapping]] = 0
+
+    # Insert a small percentage of an absent element
+    present = compositions > 0
+    inserting = rng.random(num_alloys) < insert_probability
+    new_column, has_absent = random_column(~present, rng)
+    inserting &= has_absent
+    compositions[rows[inserting], new_column[inserting]] = (
+        rng.random(np.count_nonzero(inserting)) * size
+    )
+
+    # Delete an unprotected element from alloys with several elements
+    present = compositions > 0
+    deleting = rng.random(num_alloys) < delete_probability
+    deleting &= present.sum(axis=1) > 1
+    old_column, has_deletable = random_column(present & ~protected, rng)
+    deleting &= has_deletable
+    compositions[rows[deleting], old_column[deleting]] = 0
+
+    structures = population.structures
+    if structures is not None:
+        structure_names = list(prototypes.keys())
+        structures = [
+            str(rng.choice(structure_names))
+            if s is not None and rng.random() < structure_probability
+            else s
+            for s in structures
+        ]
+
+    compositions = project(compositions, elements, constraints, rng)
+
+    return AlloyBatch(
+        compositions,
+        elements,
+        structures=structures,
+        constraints=constraints,
+    )
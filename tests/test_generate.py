@@ -213,3 +213,131 @@ def test_mixture():
 
     assert mg.generate.mixture(["Cu[A1]", "Fe[A2]"]) == "Cu50Fe50[A1]"
     assert mg.generate.mixture(["Cu[A2]", "Fe[A1]"]) == "Cu50Fe50[A2]"
+
+
+def test_perturb_batch():
+    constraints = {
+        "percentages": {
+            "Cu": {"min": 0.2, "max": 0.6},
+            "Ni": {"min": 0.01, "max": 0.99, "precedence": 1},
+        },
+        "max_elements": 4,
+        "min_elements": 2,
+        "percentage_step": 0.01,
+        "allowed_elements": ["Cu", "Ni", "Fe", "Zr", "Al", "Ti"],
+    }
+    population = mg.AlloyBatch.from_alloys(
+        ["Ni60Cu40", "Ni50Cu30Fe20", "Ni70Cu20Zr10"] * 100
+    )
+
+    perturbed = mg.generate.perturb_batch(
+        population, size=0.1, rng=0, constraints=constraints
+    )
+
+    assert len(perturbed) == len(population)
+    assert set(perturbed.elements) == set(constraints["allowed_elements"])
+    assert perturbed.compositions.sum(axis=1) == pytest.approx(1.0)
+    assert perturbed.num_elements.min() >= 2
+    assert perturbed.num_elements.max() <= 4
+
+    alloys = perturbed[:20].to_alloys()
+    check_constraints(alloys, alloys[0].constraints)
+
+    repeated = mg.generate.perturb_batch(
+        population, size=0.1, rng=0, constraints=constraints
+    )
+    assert (repeated.compositions == perturbed.compositions).all()
+
+
+def test_mixtures():
+    parents = ["Cu50Zr50", "Fe50Ni50", "Al"]
+    weights = [[1, 0, 0], [0.5, 0.5, 0], [0.45, 0.05, 0.5]]
+
+    mixed = mg.generate.mixtures(parents, weights)
+
+    assert len(mixed) == len(weights)
+    for i in range(len(weights)):
+        assert mixed[i] == mg.generate.mixture(
+            [mg.Alloy(p) for p in parents], weights[i]
+        )
+
+    assert mg.generate.mixtures(["Cu[A1]", "Fe[A2]"], [[0.5, 0.5]])[0] == (
+        "Cu50Fe50[A1]"
+    )
+
+    crossed = mg.generate.pairwise_mixtures(
+        ["Cu50Zr50", "Fe"], ["Fe50Ni50", "Cu"], [0.9, 0.5]
+    )
+    assert crossed[0].composition == {
+        "Cu": 0.45,
+        "Zr": 0.45,
+        "Fe": 0.05,
+        "Ni": 0.05,
+    }
+    assert crossed[1] == "Cu50Fe50"
+
+
+def test_quasirandom_alloys():
+    for method in ["sobol", "halton", "lhs"]:
+        alloys = mg.generate.quasirandom_alloys(
+            256, ["Cu", "Zr", "Al"], method=method, rng=0
+        )
+        assert len(alloys) == 256
+        assert alloys.compositions.sum(axis=1) == pytest.approx(1.0)
+        assert alloys.compositions.mean(axis=0) == pytest.approx(
+            [1 / 3] * 3, abs=0.02
+        )
+
+    constraints = {"Zr": {"min": 0.4, "max": 0.6}, "Al": {"max": 0.1}}
+    alloys = mg.generate.quasirandom_alloys(
+        500,
+        ["Cu", "Zr", "Al", "Ni", "Ti", "Fe"],
+        min_elements=2,
+        max_elements=4,
+        percentage_constraints=constraints,
+        rng=0,
+    )
+    assert alloys.num_elements.min() >= 2
+    assert alloys.num_elements.max() <= 4
+
+    zr = alloys.compositions[:, alloys.element_index["Zr"]]
+    al = alloys.compositions[:, alloys.element_index["Al"]]
+    assert zr.min() >= 0.4 and zr.max() <= 0.6
+    assert al.max() <= 0.1
+
+
+def test_constrained_random_alloys():
+    constraints = {
+        "percentages": {
+            "Zr": {"precedence": 2},
+            "Cu": {"precedence": 1, "max": 0.3},
+            "Al": {"min": 0.05, "max": 0.2},
+            "*": {"max": 0.15},
+        },
+        "min_elements": 3,
+        "max_elements": 5,
+        "percentage_step": 0.005,
+    }
+
+    alloys = mg.generate.constrained_random_alloys(
+        200,
+        min_elements=constraints["min_elements"],
+        max_elements=constraints["max_elements"],
+        percentage_constraints=constraints["percentages"],
+        percentage_step=constraints["percentage_step"],
+        allowed_elements=["Zr", "Cu", "Al", "Ni", "Ti", "Fe", "Co"],
+        rng=0,
+    )
+
+    assert alloys.compositions.sum(axis=1) == pytest.approx(1.0)
+    assert alloys.num_elements.min() >= 3
+    assert alloys.num_elements.max() <= 5
+
+    converted = alloys.to_alloys()
+    check_constraints(converted, constraints)
+    for i, alloy in enumerate(converted):
+        assert alloy == mg.Alloy(alloys[i])
+        for element in alloy.elements:
+            assert alloy.composition[element] == pytest.approx(
+                alloys.compositions[i, alloys.element_index[element]]
+            )